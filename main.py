@@ -1,115 +1,200 @@
 import os
 import sys
 import re
-from youtube_transcript_api import YouTubeTranscriptApi
-from urllib.parse import urlparse, parse_qs
-import argparse
-from datetime import datetime
+import string
+import threading
+from collections import namedtuple
+from itertools import chain, islice
+from operator import itemgetter
+from youtube_transcript_api import YouTubeTranscriptApi, CouldNotRetrieveTranscript
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+# YouTube video IDs are exactly 11 characters from [A-Za-z0-9_-]
+_VIDEO_ID_RE = re.compile(
+    r'(?:^|[/?&=])(?:v=|youtu\.be/|embed/|shorts/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])',
+    re.ASCII
+)
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+
+# Large write buffer so streamed transcripts hit disk in few syscalls
+_WRITE_BUFFER_SIZE = 1 << 17
+
+# Number of characters of a saved transcript echoed by the CLI
+_PREVIEW_LEN = 500
+
+# Compact record describing one available transcript track
+LangInfo = namedtuple('LangInfo', 'language language_code is_generated')
+
+# Transcript listings are reused for a short while only, since the caption
+# URLs they hold may expire
+_LIST_CACHE_SIZE = 256
+_LIST_CACHE_TTL = 300  # seconds
+
+# Concurrent lookups of one video wait on a shared lock instead of each hitting YouTube;
+# a fixed set of locks keeps memory bounded at the cost of rare waits between videos
+_LIST_LOCK_STRIPES = 64
 
 class YouTubeTranscriptExtractor:
     def __init__(self):
-        self.supported_languages = ['en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko', 'zh']
         self.api = YouTubeTranscriptApi()
+        self._list_cache = {}
+        self._list_cache_lock = threading.Lock()
+        self._list_fetch_locks = [threading.Lock() for _ in range(_LIST_LOCK_STRIPES)]
+
+    def _list_transcripts(self, video_id):
+        """List available transcripts for a video, reusing a recent listing for the same ID"""
+        with self._list_fetch_locks[hash(video_id) % _LIST_LOCK_STRIPES]:
+            now = time.monotonic()
+            with self._list_cache_lock:
+                cached = self._list_cache.get(video_id)
+            if cached and now - cached[0] < _LIST_CACHE_TTL:
+                return cached[1]
 
-    def extract_video_id(self, url):
+            transcript_list = self.api.list(video_id)
+            with self._list_cache_lock:
+                self._list_cache.pop(video_id, None)
+                self._list_cache[video_id] = (now, transcript_list)
+                if len(self._list_cache) > _LIST_CACHE_SIZE:
+                    # Dicts keep insertion order, so the first key is the oldest listing
+                    del self._list_cache[next(iter(self._list_cache))]
+            return transcript_list
+
+    def clear_transcript_cache(self):
+        """Forget cached transcript listings so the next lookup hits YouTube again"""
+        with self._list_cache_lock:
+            self._list_cache.clear()
+
+    @staticmethod
+    def extract_video_id(url):
         """Extract video ID from various YouTube URL formats"""
-        # Handle different YouTube URL formats
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-            r'youtube\.com\/watch\?.*v=([^&\n?#]+)'
-        ]
+        # If it's already just a video ID, skip the regex entirely
+        if len(url) == 11 and _VIDEO_ID_CHARS.issuperset(url):
+            return url
 
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        # Handle different YouTube URL formats
+        if 'youtu' in url:
+            match = _VIDEO_ID_RE.search(url)
             if match:
                 return match.group(1)
 
-        # If it's already just a video ID
-        if len(url) == 11 and url.isalnum():
-            return url
-
         raise ValueError("Invalid YouTube URL or video ID")
 
     def get_transcript(self, video_id, languages=['en']):
         """Get transcript for a video with language preferences"""
         try:
             # Try to get transcript in preferred languages
-            transcript_list = self.api.list(video_id)
+            transcript_list = self._list_transcripts(video_id)
 
-            # First try manually created transcripts in preferred languages
-            for lang in languages:
-                try:
-                    transcript = transcript_list.find_manually_created_transcript([lang])
-                    return transcript.fetch().to_raw_data(), lang, 'manual'
-                except:
-                    continue
-
-            # Then try auto-generated transcripts in preferred languages
-            for lang in languages:
-                try:
-                    transcript = transcript_list.find_generated_transcript([lang])
-                    return transcript.fetch().to_raw_data(), lang, 'auto-generated'
-                except:
-                    continue
-
-            # If no preferred language found, get any available transcript
-            try:
-                transcript = transcript_list.find_transcript(['en'])
+            # Index available transcripts by language code and kind
+            by_lang = {}
+            for transcript in transcript_list:
+                kind = 'generated' if transcript.is_generated else 'manual'
+                by_lang.setdefault(transcript.language_code, {})[kind] = transcript
+
+            # First try manually created, then auto-generated transcripts in preferred languages
+            for kind, source in (('manual', 'manual'), ('generated', 'auto-generated')):
+                for lang in languages:
+                    transcript = by_lang.get(lang, {}).get(kind)
+                    if transcript:
+                        return transcript.fetch().to_raw_data(), lang, source
+
+            # If no preferred language found, fall back to English
+            english = by_lang.get('en', {})
+            transcript = english.get('manual') or english.get('generated')
+            if transcript:
                 return transcript.fetch().to_raw_data(), 'en', 'fallback'
-            except:
-                # Get first available transcript
-                available_transcripts = list(transcript_list)
-                if available_transcripts:
-                    transcript = available_transcripts[0]
-                    return transcript.fetch().to_raw_data(), transcript.language_code, 'available'
-                else:
-                    raise Exception("No transcripts available")
 
-        except Exception as e:
+            # Get first available transcript
+            transcript = next(iter(transcript_list), None)
+            if transcript:
+                return transcript.fetch().to_raw_data(), transcript.language_code, 'available'
+
+        except CouldNotRetrieveTranscript as e:
             raise Exception(f"Error fetching transcript: {str(e)}")
 
-    def format_transcript(self, transcript_data, include_timestamps=True, chunk_size=None):
+        raise Exception("Error fetching transcript: No transcripts available")
+
+    @classmethod
+    def format_transcript(cls, transcript_data, include_timestamps=True, chunk_size=None):
         """Format transcript data into readable text"""
         if include_timestamps:
-            formatted_text = []
-            for entry in transcript_data:
-                timestamp = self.seconds_to_timestamp(entry['start'])
-                text = entry['text'].strip()
-                formatted_text.append(f"[{timestamp}] {text}")
-            result = '\n'.join(formatted_text)
+            # str.join beats io.StringIO writes here; use format_transcript_iter to bound memory
+            fmt_ts = cls.seconds_to_timestamp
+            result = '\n'.join(
+                f"[{fmt_ts(entry['start'])}] {entry['text'].strip()}"
+                for entry in transcript_data
+            )
+        elif chunk_size:
+            # If chunk_size is specified, lazily build chunks straight from the entries
+            return cls._iter_chunks(transcript_data, chunk_size)
         else:
-            # Just concatenate all text
-            result = ' '.join([entry['text'].strip() for entry in transcript_data])
-            # Clean up extra spaces
-            result = re.sub(r'\s+', ' ', result).strip()
-
-        # If chunk_size is specified, split into chunks
-        if chunk_size and not include_timestamps:
-            chunks = [result[i:i+chunk_size] for i in range(0, len(result), chunk_size)]
-            return chunks
+            # Concatenate all text, collapsing whitespace in a single C-level pass
+            texts = map(itemgetter('text'), transcript_data)
+            result = ' '.join(chain.from_iterable(map(str.split, texts)))
 
         return result
 
-    def seconds_to_timestamp(self, seconds):
+    @staticmethod
+    def _iter_chunks(transcript_data, chunk_size):
+        """Yield plain text in chunks of at most chunk_size characters, split on word boundaries"""
+        words = []
+        size = 0
+        for entry in transcript_data:
+            for word in entry['text'].split():
+                if words and size + 1 + len(word) > chunk_size:
+                    yield ' '.join(words)
+                    words = []
+                    size = 0
+                # A single word longer than chunk_size is kept whole in its own chunk
+                size += len(word) + 1 if words else len(word)
+                words.append(word)
+        if words:
+            yield ' '.join(words)
+
+    @classmethod
+    def format_transcript_iter(cls, transcript_data, include_timestamps=True):
+        """Yield transcript text in pieces that join to format_transcript's output"""
+        if include_timestamps:
+            fmt_ts = cls.seconds_to_timestamp
+            sep = ''
+            for entry in transcript_data:
+                yield f"{sep}[{fmt_ts(entry['start'])}] {entry['text'].strip()}"
+                sep = '\n'
+        else:
+            # Single line of text with whitespace collapsed across entries
+            sep = ''
+            for entry in transcript_data:
+                text = ' '.join(entry['text'].split())
+                if text:
+                    yield sep + text
+                    sep = ' '
+
+    @staticmethod
+    def seconds_to_timestamp(seconds):
         """Convert seconds to MM:SS or HH:MM:SS format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        seconds = int(seconds % 60)
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
 
         if hours > 0:
             return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         else:
             return f"{minutes:02d}:{seconds:02d}"
 
-    def save_to_file(self, text, filename=None, video_id=None):
-        """Save transcript to a text file"""
+    @staticmethod
+    def save_to_file(text, filename=None, video_id=None):
+        """Save transcript to a text file from a string or an iterable of strings"""
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"youtube_transcript_{video_id}_{timestamp}.txt"
 
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(text)
+            # Writes larger than the buffer are passed straight through to the file
+            with open(filename, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+                if isinstance(text, str):
+                    f.write(text)
+                else:
+                    f.writelines(text)
             return filename
         except Exception as e:
             raise Exception(f"Error saving file: {str(e)}")
@@ -117,15 +202,11 @@ class YouTubeTranscriptExtractor:
     def get_video_info(self, video_id):
         """Get basic video information"""
         try:
-            transcript_list = self.api.list(video_id)
-            available_languages = []
-            for transcript in transcript_list:
-                lang_info = {
-                    'language': transcript.language,
-                    'language_code': transcript.language_code,
-                    'is_generated': transcript.is_generated
-                }
-                available_languages.append(lang_info)
+            transcript_list = self._list_transcripts(video_id)
+            available_languages = [
+                LangInfo(transcript.language, transcript.language_code, transcript.is_generated)
+                for transcript in transcript_list
+            ]
 
             return {
                 'video_id': video_id,
@@ -135,77 +216,138 @@ class YouTubeTranscriptExtractor:
         except Exception as e:
             raise Exception(f"Error getting video info: {str(e)}")
 
+# Extractor shared by the module-level helpers so repeat calls reuse its listing cache
+_default_extractor = YouTubeTranscriptExtractor()
+
+def _copy_head(pieces, head, limit):
+    """Yield pieces unchanged while appending their first limit characters to head"""
+    for piece in pieces:
+        if limit > 0:
+            head.append(piece[:limit])
+            limit -= len(piece)
+        yield piece
+
+def _save_transcript(extractor, transcript_data, video_id, output, include_timestamps, chunk_size):
+    """Format a fetched transcript and write it to one or more files"""
+    # Handle chunked output
+    if chunk_size and not include_timestamps:
+        # Chunks are generated lazily, so write each one as it is produced
+        chunks = extractor.format_transcript(transcript_data, include_timestamps=False, chunk_size=chunk_size)
+
+        # Peek at the first two chunks to tell whether -o needs a per-chunk suffix
+        first = list(islice(chunks, 2))
+        suffixed = len(first) > 1
+
+        base, ext = os.path.splitext(output) if output else (None, None)
+        count = 0
+        for i, chunk in enumerate(chain(first, chunks), 1):
+            if not output:
+                filename = f"transcript_chunk_{i}_{video_id}.txt"
+            elif suffixed:
+                filename = f"{base}_chunk_{i}{ext}"
+            else:
+                filename = output
+
+            saved_file = extractor.save_to_file(chunk, filename, video_id)
+            print(f"Chunk {i} saved to: {saved_file}")
+            count = i
+        print(f"Text split into {count} chunks")
+    else:
+        # Stream to file, copying just enough of the text to tell if the preview is truncated
+        head = []
+        pieces = extractor.format_transcript_iter(transcript_data, include_timestamps)
+        pieces = _copy_head(pieces, head, _PREVIEW_LEN + 1)
+        saved_file = extractor.save_to_file(pieces, output, video_id)
+        print(f"Transcript saved to: {saved_file}")
+
+        # Show preview
+        head_text = ''.join(head)
+        preview = head_text[:_PREVIEW_LEN] + "..." if len(head_text) > _PREVIEW_LEN else head_text
+        print(f"\nPreview:\n{preview}")
+
 def main():
+    # Imported here so module use doesn't pay for CLI setup
+    import argparse
+
     parser = argparse.ArgumentParser(description='Extract transcripts from YouTube videos')
-    parser.add_argument('url', help='YouTube video URL or video ID')
+    parser.add_argument('url', nargs='+', help='YouTube video URL(s) or video ID(s)')
     parser.add_argument('-l', '--languages', nargs='+', default=['en'],
                        help='Preferred languages (default: en)')
     parser.add_argument('-o', '--output', help='Output filename')
     parser.add_argument('--no-timestamps', action='store_true',
                        help='Exclude timestamps from output')
     parser.add_argument('--chunk-size', type=int,
-                       help='Split text into chunks of specified size (characters)')
+                       help='Split text into chunks of at most this many characters, on word boundaries')
     parser.add_argument('--info', action='store_true',
                        help='Show video info and available languages')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Number of videos to fetch concurrently (default: 8)')
 
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     extractor = YouTubeTranscriptExtractor()
+    failed = False
 
-    try:
-        # Extract video ID
-        video_id = extractor.extract_video_id(args.url)
+    # Extract video IDs, reporting bad input without aborting the other videos
+    video_ids = []
+    for url in args.url:
+        try:
+            video_id = extractor.extract_video_id(url)
+        except ValueError as e:
+            print(f"Error ({url}): {e}", file=sys.stderr)
+            failed = True
+            continue
         print(f"Processing video ID: {video_id}")
+        video_ids.append(video_id)
 
-        # Show video info if requested
-        if args.info:
-            info = extractor.get_video_info(video_id)
+    # Show video info if requested
+    if args.info:
+        for video_id in video_ids:
+            try:
+                info = extractor.get_video_info(video_id)
+            except Exception as e:
+                print(f"Error ({video_id}): {e}", file=sys.stderr)
+                failed = True
+                continue
             print(f"\nVideo URL: {info['video_url']}")
             print("Available transcripts:")
             for lang in info['available_languages']:
-                status = "Auto-generated" if lang['is_generated'] else "Manual"
-                print(f"  - {lang['language']} ({lang['language_code']}) - {status}")
-            return
-
-        # Get transcript
+                status = "Auto-generated" if lang.is_generated else "Manual"
+                print(f"  - {lang.language} ({lang.language_code}) - {status}")
+    elif video_ids:
+        # Get transcripts concurrently, saving each as it arrives in input order
         print(f"Fetching transcript in languages: {args.languages}")
-        transcript_data, language, source = extractor.get_transcript(video_id, args.languages)
-        print(f"Found transcript in '{language}' ({source})")
-
-        # Format transcript
         include_timestamps = not args.no_timestamps
-        formatted_text = extractor.format_transcript(
-            transcript_data,
-            include_timestamps=include_timestamps,
-            chunk_size=args.chunk_size
-        )
-
-        # Handle chunked output
-        if isinstance(formatted_text, list):
-            print(f"Text split into {len(formatted_text)} chunks")
-            for i, chunk in enumerate(formatted_text, 1):
-                filename = args.output or f"transcript_chunk_{i}_{video_id}.txt"
-                if len(formatted_text) > 1:
-                    base, ext = os.path.splitext(filename)
-                    filename = f"{base}_chunk_{i}{ext}"
-
-                saved_file = extractor.save_to_file(chunk, filename, video_id)
-                print(f"Chunk {i} saved to: {saved_file}")
-        else:
-            # Save to file
-            saved_file = extractor.save_to_file(formatted_text, args.output, video_id)
-            print(f"Transcript saved to: {saved_file}")
-
-            # Show preview
-            preview = formatted_text[:500] + "..." if len(formatted_text) > 500 else formatted_text
-            print(f"\nPreview:\n{preview}")
-
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(extractor.get_transcript, video_id, args.languages)
+                for video_id in video_ids
+            ]
+            for video_id, future in zip(video_ids, futures):
+                try:
+                    transcript_data, language, source = future.result()
+                    print(f"Found transcript for {video_id} in '{language}' ({source})")
+
+                    # Keep output files distinct when processing several videos
+                    output = args.output
+                    if output and len(args.url) > 1:
+                        base, ext = os.path.splitext(output)
+                        output = f"{base}_{video_id}{ext}"
+
+                    _save_transcript(extractor, transcript_data, video_id, output,
+                                    include_timestamps, args.chunk_size)
+                except Exception as e:
+                    print(f"Error ({video_id}): {e}", file=sys.stderr)
+                    failed = True
+
+    if failed:
         sys.exit(1)
 
 # Example usage as a module
-def extract_youtube_transcript(url, languages=['en'], include_timestamps=False, chunk_size=None):
+def extract_youtube_transcript(url, languages=['en'], include_timestamps=False, chunk_size=None,
+                               extractor=None):
     """
     Simple function to extract YouTube transcript
 
@@ -213,12 +355,14 @@ def extract_youtube_transcript(url, languages=['en'], include_timestamps=False,
         url: YouTube URL or video ID
         languages: List of preferred languages
         include_timestamps: Whether to include timestamps
-        chunk_size: Split into chunks of this size (characters)
+        chunk_size: Split into chunks of at most this size (characters), on word boundaries
+        extractor: YouTubeTranscriptExtractor to use (default: one shared by module calls)
 
     Returns:
         String or list of strings (if chunked)
     """
-    extractor = YouTubeTranscriptExtractor()
+    if extractor is None:
+        extractor = _default_extractor
 
     try:
         video_id = extractor.extract_video_id(url)
@@ -229,6 +373,8 @@ def extract_youtube_transcript(url, languages=['en'], include_timestamps=False,
             include_timestamps=include_timestamps,
             chunk_size=chunk_size
         )
+        if not isinstance(formatted_text, str):
+            formatted_text = list(formatted_text)
 
         return {
             'text': formatted_text,
@@ -239,5 +385,40 @@ def extract_youtube_transcript(url, languages=['en'], include_timestamps=False,
     except Exception as e:
         raise Exception(f"Failed to extract transcript: {str(e)}")
 
+def extract_youtube_transcripts_batch(urls, languages=['en'], include_timestamps=False, chunk_size=None,
+                                      max_workers=8):
+    """
+    Extract transcripts for several YouTube videos concurrently
+
+    Args:
+        urls: Iterable of YouTube URLs or video IDs
+        languages: List of preferred languages
+        include_timestamps: Whether to include timestamps
+        chunk_size: Split into chunks of at most this size (characters), on word boundaries
+        max_workers: Maximum number of videos fetched at the same time
+
+    Returns:
+        List with one entry per URL, in input order: the result dict (see
+        extract_youtube_transcript) on success, or the raised Exception if
+        that video failed. One failure does not affect the other videos.
+    """
+    # One extractor for the whole batch, so workers share its HTTP session and listing cache
+    extractor = YouTubeTranscriptExtractor()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(extract_youtube_transcript, url, languages, include_timestamps, chunk_size,
+                            extractor)
+            for url in urls
+        ]
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
 if __name__ == "__main__":
     main()
\ No newline at end of file